@@ -2,16 +2,18 @@
 # main.py
 import os
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 import argparse
-import schedule
+import re
 import time
 import json
+import functools
+import gzip
+import hashlib
+import types
+from concurrent.futures import ThreadPoolExecutor
 
-from openai import OpenAI
-from openai.types.beta.agent import Agent
-from openai.types.beta.tool import Tool, Function, ToolType
-from openai.types.beta.threads import Thread, ThreadMessage
+import orjson
 
 from services.note_poster_service import NotePosterService
 from models.article import Article
@@ -27,9 +29,69 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Final article block returned by the content simplification run. The first
+# alternative handles an article wrapped in its own ```markdown fence inside
+# the final block; the second is a plain final block. Both stop at the end of
+# the final block so any text after it is never published.
+FINAL_BLOCK_PATTERN = re.compile(
+    r"```final\n(?:```(?:markdown)?\n(.*?)\n?```\s*\n?```|(.*?)```)", re.DOTALL
+)
+
+# (connect, read) timeout in seconds for NewsAPI requests
+NEWS_API_TIMEOUT = (3.05, 10)
+
+# Extract the final article from the content simplification reply
+def extract_final_article(text):
+    """Return the Markdown inside the ```final block ("" if there is none)"""
+    final_match = FINAL_BLOCK_PATTERN.search(text)
+    if not final_match:
+        return ""
+    
+    nested_article, plain_article = final_match.groups()
+    article = nested_article if nested_article is not None else plain_article
+    return article.strip()
+
+# Heavy third-party modules (requests, openai, schedule, playwright) are
+# imported inside the functions that use them to keep start-up fast.
+
+# Shared HTTP session so NewsAPI calls reuse pooled keep-alive connections
+@functools.lru_cache(maxsize=1)
+def get_http_session():
+    """Create (once) a requests session with connection pooling and retries"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+# On-disk cache for NewsAPI responses and filter verdicts
+NEWS_CACHE_DIR = "cache/news"
+NEWS_CACHE_TTL = 60 * 60  # seconds
+VERDICT_CACHE_TTL = 24 * 60 * 60  # seconds
+
+@functools.lru_cache(maxsize=1)
+def get_news_cache():
+    """Open (once) the disk cache shared by news fetches and filter verdicts"""
+    import diskcache
+    
+    return diskcache.Cache(NEWS_CACHE_DIR)
+
 # Load configuration
+@functools.lru_cache(maxsize=1)
 def load_config():
-    """Load configuration from config.json file or environment variables"""
+    """Load configuration from config.json file or environment variables
+
+    The result is cached and returned as a read-only mapping, so repeated
+    calls do not re-read config.json.
+    """
     try:
         with open("config.json", "r") as f:
             config = json.load(f)
@@ -50,16 +112,25 @@ def load_config():
         if not config.get(key):
             raise ValueError(f"Missing required configuration: {key}")
     
-    return config
+    return types.MappingProxyType(config)
 
 # Initialize OpenAI client
 def initialize_openai_client(api_key):
     """Initialize the OpenAI client with the API key"""
+    from openai import OpenAI
+    
     return OpenAI(api_key=api_key)
 
+# Backoff settings (seconds) for polling agent runs
+RUN_POLL_INITIAL_DELAY = 0.5
+RUN_POLL_MAX_DELAY = 8.0
+RUN_POLL_BACKOFF = 1.6
+
 # Create news collection tool
 def create_news_collection_tool(news_api_key):
     """Create a tool for collecting news using News API"""
+    from openai.types.beta.tool import Tool, Function, ToolType
+    
     return Tool(
         type=ToolType.function,
         function=Function(
@@ -89,11 +160,10 @@ def create_news_collection_tool(news_api_key):
     )
 
 # Function to fetch trending news (will be called by the agent)
-def fetch_trending_news(num_articles, category="general", age_appropriate=True):
+def fetch_trending_news(num_articles, category="general", age_appropriate=True, config=None):
     """Fetch trending news from Japan using NewsAPI"""
-    import requests
-    
-    config = load_config()
+    if config is None:
+        config = load_config()
     news_api_key = config["news_api_key"]
     client = initialize_openai_client(config["openai_api_key"])
     
@@ -106,69 +176,165 @@ def fetch_trending_news(num_articles, category="general", age_appropriate=True):
     }
     
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        
-        raw_articles = []
-        for article in data.get("articles", []):
-            raw_articles.append({
-                "title": article.get("title", ""),
-                "description": article.get("description", ""),
-                "content": article.get("content", ""),
-                "url": article.get("url", ""),
-                "publishedAt": article.get("publishedAt", ""),
-                "source": article.get("source", {}).get("name", "")
-            })
+        # Top headlines barely change within an hour, so reuse recent responses
+        cache = get_news_cache()
+        cache_key = f"news:{datetime.now(timezone.utc).date().isoformat()}:{category}:{params['pageSize']}"
+        raw_articles = cache.get(cache_key)
+        
+        if not raw_articles:
+            response = get_http_session().get(url, params=params, timeout=NEWS_API_TIMEOUT)
+            response.raise_for_status()
+            # pageSize is capped at 20, so the body is small enough to parse in one go
+            logger.debug(f"NewsAPI response size: {len(response.content)} bytes")
+            data = response.json()
+            
+            raw_articles = []
+            for article in data.get("articles", []):
+                raw_articles.append({
+                    "title": article.get("title", ""),
+                    "description": article.get("description", ""),
+                    "content": article.get("content", ""),
+                    "url": article.get("url", ""),
+                    "publishedAt": article.get("publishedAt", ""),
+                    "source": article.get("source", {}).get("name", "")
+                })
+            # Don't cache an empty response so the next call retries NewsAPI
+            if raw_articles:
+                cache.set(cache_key, raw_articles, expire=NEWS_CACHE_TTL)
+        else:
+            logger.info(f"Using cached news for category '{category}'")
         
         # If age-appropriate filtering is enabled, use OpenAI to filter content
         if age_appropriate and raw_articles:
-            filtered_articles = []
-            
-            for article in raw_articles:
-                # Create a simple prompt for content filtering
-                prompt = f"""
-                評価してください: この以下の記事は小学生低学年（6〜8歳）に適切ですか？
-                記事のタイトル: {article['title']}
-                記事の概要: {article['description']}
-                記事の内容: {article['content']}
-                
+            filtered_articles = filter_age_appropriate(client, config["model"], raw_articles)
+            return filtered_articles[:num_articles]
+        
+        return raw_articles[:num_articles]
+        
+    except Exception as e:
+        logger.error(f"Error fetching news: {str(e)}")
+        return []
+
+# Terms that mark an article as unsuitable without asking OpenAI
+FAST_BLOCK_TERMS = ["殺", "テロ", "事件", "逮捕", "選挙", "汚職", "事故死", "暴行"]
+FAST_BLOCK_PATTERN = re.compile("|".join(map(re.escape, FAST_BLOCK_TERMS)))
+
+# Maximum number of concurrent per-article filter calls
+FILTER_MAX_WORKERS = 8
+
+# Maximum characters of article content sent to the filter prompt
+FILTER_CONTENT_SNIPPET_LENGTH = 300
+
+# Evaluation criteria shared by the batched and per-article filter prompts
+FILTER_CRITERIA = """
                 以下の基準で評価してください:
                 1. 暴力的な内容が含まれていないか
                 2. 政治的に議論を呼ぶ内容が含まれていないか
                 3. 性的な内容が含まれていないか
                 4. 子供が理解できる内容か
                 5. 教育的価値があるか
-                
+"""
+
+# Judge a single article (fallback when the batched response cannot be parsed,
+# run concurrently for all articles)
+def judge_article(client, model, article):
+    """Ask OpenAI whether a single article is appropriate for young children"""
+    prompt = f"""
+                評価してください: この以下の記事は小学生低学年（6〜8歳）に適切ですか？
+                記事のタイトル: {article['title']}
+                記事の概要: {article['description']}
+                記事の内容: {(article['content'] or '')[:FILTER_CONTENT_SNIPPET_LENGTH]}
+                {FILTER_CRITERIA}
                 'YES'または'NO'で答えてください。その後に短い理由を書いてください。
                 """
+    
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.0,
+    )
+    
+    result = response.choices[0].message.content
+    return result.startswith("YES")
+
+# Judge articles for age-appropriateness with a single OpenAI call
+def judge_articles(client, model, articles):
+    """Return whether each article is appropriate (None where the model gave no usable verdict)"""
+    numbered = "\n".join(
+        f"{i}. {article['title']} | {article['description']} | "
+        f"{(article['content'] or '')[:FILTER_CONTENT_SNIPPET_LENGTH]}"
+        for i, article in enumerate(articles, start=1)
+    )
+    prompt = f"""
+                評価してください: 以下の各記事は小学生低学年（6〜8歳）に適切ですか？
+                各行は「番号. タイトル | 概要 | 内容の抜粋」の形式です。
                 
-                response = client.chat.completions.create(
-                    model=config["model"],
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.0,
-                )
-                
-                result = response.choices[0].message.content
-                
-                # If the model thinks it's appropriate, add to filtered list
-                if result.startswith("YES"):
-                    filtered_articles.append(article)
-                    if len(filtered_articles) >= num_articles:
-                        break
-            
-            return filtered_articles[:num_articles]
-        
-        return raw_articles[:num_articles]
-        
-    except Exception as e:
-        logger.error(f"Error fetching news: {str(e)}")
-        return []
+                {numbered}
+                {FILTER_CRITERIA}
+                次のJSON形式のみで答えてください:
+                {{"results": [{{"index": 1, "appropriate": true}}, ...]}}
+                """
+    
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        response_format={"type": "json_object"},
+        temperature=0.0,
+    )
+    
+    try:
+        results = json.loads(response.choices[0].message.content)["results"]
+        if not isinstance(results, list) or not all(isinstance(r, dict) for r in results):
+            raise ValueError(f"Unexpected filter response shape: {results!r}")
+        verdicts = {
+            int(r["index"]): r["appropriate"]
+            for r in results
+            if isinstance(r.get("appropriate"), bool)
+        }
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to parse batched filter response, judging articles one by one: {str(e)}")
+        with ThreadPoolExecutor(max_workers=FILTER_MAX_WORKERS) as executor:
+            return list(executor.map(lambda article: judge_article(client, model, article), articles))
+    
+    return [verdicts.get(i) for i in range(1, len(articles) + 1)]
+
+# Cache key for an article's filter verdict
+def verdict_cache_key(article, model):
+    """Build a stable cache key from the model and the article's title and description"""
+    text = f"{model}\n{article['title']}\n{article['description']}"
+    return "verdict:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# Filter articles for age-appropriateness, reusing cached verdicts
+def filter_age_appropriate(client, model, articles):
+    """Return the articles judged appropriate for lower elementary school students"""
+    # Reject obviously unsuitable articles locally before any LLM call
+    articles = [
+        article for article in articles
+        if not FAST_BLOCK_PATTERN.search(f"{article['title'] or ''}\n{article['description'] or ''}")
+    ]
+    
+    cache = get_news_cache()
+    keys = [verdict_cache_key(article, model) for article in articles]
+    verdicts = [cache.get(key) for key in keys]
+    
+    # Only ask OpenAI about articles without a cached verdict
+    pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    if pending:
+        new_verdicts = judge_articles(client, model, [articles[i] for i in pending])
+        for i, verdict in zip(pending, new_verdicts):
+            verdicts[i] = verdict
+            # Missing verdicts are treated as rejected for this run only
+            if verdict is not None:
+                cache.set(keys[i], verdict, expire=VERDICT_CACHE_TTL)
+    
+    return [article for article, verdict in zip(articles, verdicts) if verdict]
 
 # Create an agent for news collection
-def create_news_collection_agent(client):
+def create_news_collection_agent(client, config):
     """Create an agent for collecting trending news"""
-    news_tool = create_news_collection_tool(load_config()["news_api_key"])
+    from openai.types.beta.agent import Agent
+    
+    news_tool = create_news_collection_tool(config["news_api_key"])
     
     agent = Agent.create(
         client=client,
@@ -186,14 +352,16 @@ def create_news_collection_agent(client):
         Return the collected news in a structured format.
         """,
         tools=[news_tool],
-        model=load_config()["model"]
+        model=config["model"]
     )
     
     return agent
 
 # Create an agent for content simplification
-def create_content_simplification_agent(client):
+def create_content_simplification_agent(client, config):
     """Create an agent for simplifying news content for elementary school students"""
+    from openai.types.beta.agent import Agent
+    
     agent = Agent.create(
         client=client,
         name="ContentSimplifier",
@@ -220,17 +388,76 @@ def create_content_simplification_agent(client):
         Remember to use hiragana for difficult kanji when necessary for the target age group.
         """,
         tools=[],
-        model=load_config()["model"]
+        model=config["model"]
     )
     
     return agent
 
+# Wait for an agent run to finish
+def wait_for_run(agent, run, on_requires_action=None):
+    """Poll an agent run with exponential backoff until it leaves the active states
+
+    Args:
+        agent: Agent that owns the run
+        run: Run object returned by ``agent.runs.create``
+        on_requires_action: Optional callback ``(run) -> run`` used to submit
+            tool outputs when the run is waiting for them. It may return None
+            when there is nothing to submit, in which case polling continues.
+    """
+    delay = RUN_POLL_INITIAL_DELAY
+    while run.status in ("queued", "in_progress", "requires_action"):
+        if run.status == "requires_action" and on_requires_action is not None:
+            submitted_run = on_requires_action(run)
+            if submitted_run is not None:
+                run = submitted_run
+                delay = RUN_POLL_INITIAL_DELAY
+                continue
+        time.sleep(delay)
+        delay = min(delay * RUN_POLL_BACKOFF, RUN_POLL_MAX_DELAY)
+        run = agent.runs.retrieve(run.id)
+    return run
+
+# Get the assistant's reply for a run
+def get_run_output(client, thread_id, run_id):
+    """Return the text of the latest assistant message created by a run ("" if none)"""
+    messages = client.beta.threads.messages.list(
+        thread_id=thread_id,
+        run_id=run_id,
+        order="desc",
+        limit=1
+    )
+    for msg in messages.data:
+        if msg.role == "assistant":
+            return msg.content[0].text.value
+    return ""
+
+# Create the note.com poster
+def create_note_poster(config):
+    """Create a NotePosterService from the configuration"""
+    return NotePosterService(
+        config["note_email"],
+        config["note_password"],
+        headless=config.get("headless", True)
+    )
+
 # Main function to process and post news
-def process_and_post_news():
-    """Main function to collect, process, and post news"""
+def process_and_post_news(note_poster=None):
+    """Main function to collect, process, and post news
+
+    Args:
+        note_poster: Optional NotePosterService that is already running. The
+            scheduler passes one so Chromium stays up between daily runs;
+            without it a browser is launched just for this post.
+    """
     logger.info("Starting news processing and posting")
     
     try:
+        # Imported here so an import failure is logged like any other error
+        from openai.types.beta.threads import Thread, ThreadMessage
+        
+        # Use a single timestamp so the article and archive always share the same date
+        run_started_at = datetime.now()
+        
         # Load configuration
         config = load_config()
         
@@ -238,8 +465,8 @@ def process_and_post_news():
         client = initialize_openai_client(config["openai_api_key"])
         
         # Create agents
-        news_agent = create_news_collection_agent(client)
-        content_agent = create_content_simplification_agent(client)
+        news_agent = create_news_collection_agent(client, config)
+        content_agent = create_content_simplification_agent(client, config)
         
         # Create a thread for multi-agent collaboration
         thread = Thread.create(client=client)
@@ -253,7 +480,7 @@ def process_and_post_news():
             client=client,
             thread_id=thread.id,
             role="user",
-            content=f"今日（{datetime.now().strftime('%Y年%m月%d日')}）の日本の小学生向けニュースを5つ探してください。興味深く、教育的で、小学生低学年に適切なものを選んでください。"
+            content=f"今日（{run_started_at.strftime('%Y年%m月%d日')}）の日本の小学生向けニュースを5つ探してください。興味深く、教育的で、小学生低学年に適切なものを選んでください。"
         )
         
         # Start a run with the news collection agent
@@ -263,29 +490,30 @@ def process_and_post_news():
         )
         
         # Handle the news collection agent's tool calls
-        while news_run.status == "in_progress" or news_run.status == "requires_action":
-            news_run = news_agent.runs.retrieve(news_run.id)
+        def submit_news_tool_outputs(run):
+            required_action = run.required_action
+            if not required_action or required_action.type != "submit_tool_outputs":
+                return None
             
-            if news_run.status == "requires_action" and news_run.required_action and news_run.required_action.type == "submit_tool_outputs":
-                tool_outputs = []
-                for tool_call in news_run.required_action.submit_tool_outputs.tool_calls:
-                    if tool_call.function.name == "fetch_trending_news":
-                        args = json.loads(tool_call.function.arguments)
-                        num_articles = args.get("num_articles", 5)
-                        category = args.get("category", "general")
-                        age_appropriate = args.get("age_appropriate", True)
-                        result = fetch_trending_news(num_articles, category, age_appropriate)
-                        tool_outputs.append({
-                            "tool_call_id": tool_call.id,
-                            "output": json.dumps(result)
-                        })
-                
-                news_run = news_agent.runs.submit_tool_outputs(
-                    run_id=news_run.id,
-                    tool_outputs=tool_outputs
-                )
+            tool_outputs = []
+            for tool_call in required_action.submit_tool_outputs.tool_calls:
+                if tool_call.function.name == "fetch_trending_news":
+                    args = json.loads(tool_call.function.arguments)
+                    num_articles = args.get("num_articles", 5)
+                    category = args.get("category", "general")
+                    age_appropriate = args.get("age_appropriate", True)
+                    result = fetch_trending_news(num_articles, category, age_appropriate, config)
+                    tool_outputs.append({
+                        "tool_call_id": tool_call.id,
+                        "output": json.dumps(result)
+                    })
             
-            time.sleep(1)
+            return news_agent.runs.submit_tool_outputs(
+                run_id=run.id,
+                tool_outputs=tool_outputs
+            )
+        
+        news_run = wait_for_run(news_agent, news_run, submit_news_tool_outputs)
         
         # Check if news collection was successful
         if news_run.status != "completed":
@@ -295,12 +523,7 @@ def process_and_post_news():
             return False
         
         # Get the messages from the thread to extract the collected news
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
-        collected_news = ""
-        for msg in messages.data:
-            if msg.role == "assistant" and msg.run_id == news_run.id:
-                collected_news = msg.content[0].text.value
-                break
+        collected_news = get_run_output(client, thread.id, news_run.id)
         
         logger.info(f"News collection completed: {len(collected_news)} characters")
         
@@ -328,19 +551,23 @@ def process_and_post_news():
             - 3〜4つのセクション（## 見出し）
             - 難しい概念の簡単な説明
             - 簡単なまとめ
+            
+            以下を実行してください：
+            (1) 記事を書く
+            (2) 小学校低学年向けに適切か（文章の難易度、使われている言葉、構成など）を自己評価する
+            (3) 改善点があれば修正版を作る
+            最終出力は修正版のマークダウンのみとし、```final で始まり ``` で終わるブロックで囲んで返してください。
             """
         )
         
         # Start a run with the content simplification agent
         content_run = content_agent.runs.create(
             thread_id=thread.id,
-            instructions="小学校低学年（6〜8歳）向けにニュース記事を作成してください。簡単な言葉、短い文、明確な構成で書いてください。"
+            instructions="小学校低学年（6〜8歳）向けにニュース記事を作成し、自己評価に基づいて改善した最終版のみを返してください。簡単な言葉、短い文、明確な構成で書いてください。"
         )
         
         # Wait for content simplification to complete
-        while content_run.status == "in_progress" or content_run.status == "requires_action":
-            content_run = content_agent.runs.retrieve(content_run.id)
-            time.sleep(1)
+        content_run = wait_for_run(content_agent, content_run)
         
         # Check if content simplification was successful
         if content_run.status != "completed":
@@ -350,89 +577,30 @@ def process_and_post_news():
             return False
         
         # Get the messages from the thread to extract the simplified content
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
-        simplified_content = ""
-        for msg in messages.data:
-            if msg.role == "assistant" and msg.run_id == content_run.id:
-                simplified_content = msg.content[0].text.value
-                break
+        simplified_output = get_run_output(client, thread.id, content_run.id)
+        simplified_content = extract_final_article(simplified_output)
+        if not simplified_content:
+            # Never post the raw reply: it contains the draft and self-review
+            logger.error("Final article block not found or empty in the simplification response")
+            return False
         
         logger.info(f"Content simplification completed: {len(simplified_content)} characters")
         
-        # Add a step to validate the simplified content
-        logger.info("Validating simplified content")
-        validate_message = ThreadMessage.create(
-            client=client,
-            thread_id=thread.id,
-            role="user",
-            content="この記事の内容は小学校低学年向けに適切ですか？文章の難易度、使われている言葉、構成などが対象年齢に合っているか確認してください。改善点があれば具体的に指摘してください。"
-        )
-        
-        # Start a run with the content agent to validate
-        validate_run = content_agent.runs.create(
-            thread_id=thread.id,
-            instructions="記事の難易度、語彙、構成が小学校低学年（6〜8歳）向けに適切か評価し、必要に応じて改善を提案してください。"
-        )
-        
-        # Wait for validation to complete
-        while validate_run.status == "in_progress":
-            validate_run = content_agent.runs.retrieve(validate_run.id)
-            time.sleep(1)
-            
-        # Get validation feedback
-        messages = client.beta.threads.messages.list(thread_id=thread.id)
-        validation_feedback = ""
-        for msg in messages.data:
-            if msg.role == "assistant" and msg.run_id == validate_run.id:
-                validation_feedback = msg.content[0].text.value
-                break
-                
-        logger.info(f"Content validation completed")
-        
-        # If validation suggests improvements, request a revised version
-        if "改善" in validation_feedback or "修正" in validation_feedback:
-            logger.info("Requesting content improvements based on validation")
-            improve_message = ThreadMessage.create(
-                client=client,
-                thread_id=thread.id,
-                role="user",
-                content="指摘された改善点に基づいて、記事を修正してください。小学校低学年の子どもが理解できるように、さらに平易な言葉と表現を使ってください。"
-            )
-            
-            # Start a run with the content agent to improve
-            improve_run = content_agent.runs.create(
-                thread_id=thread.id,
-                instructions="フィードバックに基づいて記事を改善し、小学校低学年向けにさらに簡潔で分かりやすくしてください。"
-            )
-            
-            # Wait for improvement to complete
-            while improve_run.status == "in_progress":
-                improve_run = content_agent.runs.retrieve(improve_run.id)
-                time.sleep(1)
-                
-            # Get improved content
-            messages = client.beta.threads.messages.list(thread_id=thread.id)
-            for msg in messages.data:
-                if msg.role == "assistant" and msg.run_id == improve_run.id:
-                    simplified_content = msg.content[0].text.value
-                    break
-                    
-            logger.info("Content improvements completed")
-        
         # Step 3: Post to note.com
         logger.info("Posting content to note.com")
-        note_poster = NotePosterService(config["note_email"], config["note_password"])
         
         # Create article object
         article = Article(
             title="",  # Title will be extracted from Markdown content
             content=simplified_content,
             status="draft",
-            created_at=datetime.now(),
+            created_at=run_started_at,
             improved_content=None
         )
         
-        # Post article
+        # Post article (login state is reused via note_state.json)
+        if note_poster is None:
+            note_poster = create_note_poster(config)
         post_success = note_poster.post_article(article)
         
         if post_success:
@@ -441,14 +609,15 @@ def process_and_post_news():
             # Archive the thread for reference
             thread_archive = {
                 "thread_id": thread.id,
-                "date": datetime.now().isoformat(),
+                "date": run_started_at,
                 "article_content": simplified_content
             }
             
-            # Save thread archive
+            # Save thread archive (gzip-compressed; Japanese text shrinks several times)
             os.makedirs("archives", exist_ok=True)
-            with open(f"archives/thread_{datetime.now().strftime('%Y%m%d')}.json", "w") as f:
-                json.dump(thread_archive, f, ensure_ascii=False, indent=2)
+            archive_path = f"archives/thread_{run_started_at.strftime('%Y%m%d')}.json.gz"
+            with gzip.open(archive_path, "wb", compresslevel=6) as f:
+                f.write(orjson.dumps(thread_archive, option=orjson.OPT_INDENT_2))
             
             return True
         else:
@@ -462,21 +631,30 @@ def process_and_post_news():
         return False
 
 # Schedule function
-def setup_scheduler():
+def setup_scheduler(note_poster=None):
     """Set up a scheduler to run the process daily"""
+    import schedule
+    
     config = load_config()
     post_time = config.get("post_time", "08:00")
     
     logger.info(f"Setting up scheduler to run daily at {post_time}")
-    schedule.every().day.at(post_time).do(process_and_post_news)
+    schedule.every().day.at(post_time).do(process_and_post_news, note_poster)
 
 # Run scheduler
 def run_scheduler():
     """Run the scheduler"""
+    import schedule
+    
     logger.info("Starting scheduler")
     while True:
+        # Sleep until the next job is due instead of waking up every minute
+        idle_seconds = schedule.idle_seconds()
+        if idle_seconds is None:
+            time.sleep(60)
+        elif idle_seconds > 0:
+            time.sleep(idle_seconds)
         schedule.run_pending()
-        time.sleep(60)
 
 # Run immediately or with scheduler
 if __name__ == "__main__":
@@ -488,5 +666,7 @@ if __name__ == "__main__":
         logger.info("Running immediately")
         process_and_post_news()
     else:
-        setup_scheduler()
-        run_scheduler()
\ No newline at end of file
+        # Keep one browser running for the life of the scheduler
+        with create_note_poster(load_config()) as note_poster:
+            setup_scheduler(note_poster)
+            run_scheduler()
\ No newline at end of file
@@ -3,9 +3,23 @@ from datetime import datetime
 from typing import Optional
 
 
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    """日時をISO形式の文字列に変換（Noneはそのまま）"""
+    return value.isoformat() if value else None
+
+
 class Article:
     """記事モデル"""
 
+    __slots__ = (
+        "title",
+        "content",
+        "status",
+        "created_at",
+        "published_at",
+        "improved_content",
+    )
+
     def __init__(
         self,
         title: str,
@@ -43,8 +57,8 @@ class Article:
             "title": self.title,
             "content": self.content,
             "status": self.status,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "published_at": self.published_at.isoformat() if self.published_at else None,
+            "created_at": _isoformat(self.created_at),
+            "published_at": _isoformat(self.published_at),
             "improved_content": self.improved_content,
         }
 
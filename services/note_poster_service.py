@@ -1,32 +1,160 @@
 # services/note_poster_service.py
 import logging
+import os
 import re
 import time
 from datetime import datetime
 
-import pyperclip
-from playwright.sync_api import sync_playwright
-
 from models.article import Article
 
+LOGIN_URL = "https://note.com/login"
+NEW_NOTE_URL = "https://note.com/notes/new"
+
+# 投稿に不要なため読み込みをブロックするリソースの種類
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+# ```markdown で始まり、``` で終わるブロック
+_MD_BLOCK_RE = re.compile(r"```markdown\n(.*?)```", re.DOTALL)
+# 最初の# で始まる行（タイトル）
+_TITLE_RE = re.compile(r"^# (.+)", re.MULTILINE)
+# 見出し行で本文を分割するパターン
+_SPLIT_RE = re.compile(r"^(#{1,3} .+)$", re.MULTILINE)
 
-class NotePosterService:
-    """Noteに記事を投稿するサービス"""
 
-    def __init__(self, email: str, password: str):
+class NotePosterService:
+    """Noteに記事を投稿するサービス
+
+    コンテキストマネージャとして使うと、ブラウザを一度だけ起動して
+    複数の記事投稿で使い回します。ログイン状態は storage_state_path に
+    保存され、次回以降の起動ではログイン処理を省略します。
+    """
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        storage_state_path: str = "note_state.json",
+        headless: bool = True,
+    ):
         """
         Note投稿サービスの初期化
 
         Args:
             email: Noteアカウントのメールアドレス
             password: Noteアカウントのパスワード
+            storage_state_path: ログイン状態（Cookie等）の保存先
+            headless: ブラウザをヘッドレスで起動するか（デバッグ時はFalse）
         """
         self.email = email
         self.password = password
+        self.storage_state_path = storage_state_path
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    def __enter__(self) -> "NotePosterService":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def start(self) -> None:
+        """ブラウザを起動し、保存済みのログイン状態があれば読み込む"""
+        if self._context is not None:
+            return
+
+        # 起動を速くするため、Playwrightは使う時点で読み込む
+        from playwright.sync_api import sync_playwright
+
+        try:
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(
+                headless=self.headless,
+                args=["--disable-dev-shm-usage", "--no-sandbox"],
+            )
+            if os.path.exists(self.storage_state_path):
+                logging.info("保存済みのログイン状態を読み込みます")
+                self._context = self._browser.new_context(
+                    storage_state=self.storage_state_path
+                )
+            else:
+                self._context = self._browser.new_context()
+
+            # 画像・動画・フォントは読み込まない
+            self._context.route("**/*", self._block_heavy_resources)
+        except Exception:
+            # 起動途中で失敗した場合もPlaywrightのドライバを残さない
+            self.close()
+            raise
+
+    @staticmethod
+    def _block_heavy_resources(route) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
+    def close(self) -> None:
+        """ブラウザを終了"""
+        if self._context is not None:
+            self._context.close()
+            self._context = None
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+            logging.info("🚀 Playwright処理が完了しました")
+
+    def login(self, page) -> None:
+        """
+        noteにログインし、ログイン状態を保存
+
+        Args:
+            page: 操作対象のページ
+        """
+        logging.info("noteへのログインを開始します")
+        page.goto(LOGIN_URL)
+        page.wait_for_selector("#email", timeout=10000)
+        page.wait_for_selector("#password", timeout=10000)
+        page.wait_for_load_state("networkidle")
+        time.sleep(1)
+
+        page.fill("#email", self.email)
+        page.fill("#password", self.password)
+        time.sleep(1)
+        page.click('button:has(div:has-text("ログイン"))')
+        page.wait_for_load_state("networkidle")
+        logging.info("✅ noteにログイン成功")
+        time.sleep(1)
+
+        # 次回以降ログインを省略できるように状態を保存
+        self._context.storage_state(path=self.storage_state_path)
+
+    def open_editor(self, page) -> None:
+        """
+        新規記事作成ページを開く（未ログインならログインしてから開く）
+
+        Args:
+            page: 操作対象のページ
+        """
+        logging.info("📝 noteの新規記事作成ページにアクセス中...")
+        page.goto(NEW_NOTE_URL)
+        page.wait_for_load_state("networkidle")
+
+        if "/login" in page.url:
+            self.login(page)
+            page.goto(NEW_NOTE_URL)
+            page.wait_for_load_state("networkidle")
+        else:
+            logging.info("✅ 保存済みのログイン状態を使用します")
 
     def remove_markdown_block(self, text: str) -> str:
         # ```markdown で始まり、``` で終わるブロックを削除
-        cleaned_text = re.sub(r"```markdown\n(.*?)```", r"\1", text, flags=re.DOTALL)
+        cleaned_text = _MD_BLOCK_RE.sub(r"\1", text)
         return cleaned_text
 
     def parse_markdown(self, markdown_content: str) -> tuple:
@@ -44,11 +172,14 @@ class NotePosterService:
         markdown_content = self.remove_markdown_block(markdown_content)
 
         # 最初の# で始まる行をタイトルとして扱う
-        title_match = re.search(r"^# (.+)", markdown_content, re.MULTILINE)
+        title_match = _TITLE_RE.search(markdown_content)
         if title_match:
             title = title_match.group(1).strip()
-            # タイトル行を除外
-            content = markdown_content.replace(title_match.group(0), "", 1).strip()
+            # タイトル行を除外（マッチ位置で切り出す）
+            content = (
+                markdown_content[: title_match.start()]
+                + markdown_content[title_match.end() :]
+            ).strip()
         else:
             # タイトルが見つからない場合は「無題」
             title = "無題の記事"
@@ -59,31 +190,22 @@ class NotePosterService:
         # セクションに分割（見出しと段落）
         sections = []
 
-        # 見出しのパターン
-        heading_pattern = re.compile(r"^(#{1,3}) (.+)", re.MULTILINE)
-
-        # セクションを抽出
-        last_pos = 0
-        for match in heading_pattern.finditer(content):
-            # 前のセクションの終わりから現在の見出しの前までをパラグラフとして追加
-            paragraph_content = content[last_pos : match.start()].strip()
-            if paragraph_content:
-                sections.append({"type": "paragraph", "content": paragraph_content})
-
-            # 見出しを追加
-            heading_level = len(match.group(1))
-            heading_text = match.group(1) + " " + match.group(2).strip()
-            sections.append(
-                {"type": f"heading{heading_level}", "content": heading_text}
-            )
-
-            last_pos = match.end()
-
-        # 最後のセクション
-        if last_pos < len(content):
-            paragraph_content = content[last_pos:].strip()
-            if paragraph_content:
-                sections.append({"type": "paragraph", "content": paragraph_content})
+        # 見出しで分割すると [段落, 見出し, 段落, 見出し, ...] の順に並ぶ
+        parts = _SPLIT_RE.split(content)
+        for i, part in enumerate(parts):
+            if i % 2 == 0:
+                # 見出しの間のテキストをパラグラフとして追加
+                paragraph_content = part.strip()
+                if paragraph_content:
+                    sections.append({"type": "paragraph", "content": paragraph_content})
+            else:
+                # 見出しを追加
+                marks, heading_body = part.split(" ", 1)
+                heading_level = len(marks)
+                heading_text = marks + " " + heading_body.strip()
+                sections.append(
+                    {"type": f"heading{heading_level}", "content": heading_text}
+                )
 
         logging.info(f"セクション数: {len(sections)}")
         return title, sections
@@ -98,6 +220,17 @@ class NotePosterService:
         Returns:
             bool: 投稿が成功したかどうか
         """
+        if self._browser is not None and not self._browser.is_connected():
+            # 長時間起動している間にブラウザが終了していたら起動し直す
+            logging.warning("ブラウザとの接続が切れているため再起動します")
+            self.close()
+            self.start()
+
+        if self._context is None:
+            # コンテキストマネージャ外から呼ばれた場合はこの投稿の間だけ起動
+            with self:
+                return self.post_article(article)
+
         logging.info(f"記事「{article.title}」をNoteに投稿します")
 
         # 改善された記事があればそれを使用、なければ通常の記事を使用
@@ -108,98 +241,73 @@ class NotePosterService:
         # Markdown記事を解析
         title, sections = self.parse_markdown(content)
 
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            context = browser.new_context()
-            page = context.new_page()
+        page = self._context.new_page()
 
-            try:
-                # ログイン
-                logging.info("noteへのログインを開始します")
-                page.goto("https://note.com/login")
-                page.wait_for_selector("#email", timeout=10000)
-                page.wait_for_selector("#password", timeout=10000)
-                page.wait_for_load_state("networkidle")
-                time.sleep(1)
-
-                page.fill("#email", self.email)
-                page.fill("#password", self.password)
-                time.sleep(1)
-                page.click('button:has(div:has-text("ログイン"))')
-                page.wait_for_load_state("networkidle")
-                logging.info("✅ noteにログイン成功")
-                time.sleep(1)
-
-                # 新規記事作成ページにアクセス
-                logging.info("📝 noteの新規記事作成ページにアクセス中...")
-                page.goto("https://note.com/notes/new")
-                page.wait_for_load_state("networkidle")
-
-                # タイトル入力
-                page.fill('textarea[placeholder="記事タイトル"]', title)
-                page.keyboard.press("Enter")
-                time.sleep(0.5)
-                logging.info(f"📝 記事タイトル '{title}' を入力しました")
-
-                # セクションごとに処理
-                for section in sections:
-                    section_type = section["type"]
-                    content = section["content"]
-
-                    if section_type == "paragraph":
-                        # 段落テキストを入力
-                        logging.info(f"📝 段落を入力中: {content[:30]}...")
-                        pyperclip.copy(content)
-                        page.keyboard.press("Control+V")
-                        page.keyboard.press("Enter")
-                        page.keyboard.press("Enter")
-
-                    elif section_type.startswith("heading"):
-                        # 見出しを入力
-                        level = int(section_type[-1])
-                        logging.info(f"📝 見出し{level}を入力中: {content}")
-
-                        # クリップボードにコピー
-                        pyperclip.copy(content)
-
-                        # 貼り付け
-                        page.keyboard.press("Control+V")
-                        page.keyboard.press("Enter")
-
-                    time.sleep(0.5)
-
-                # 記事を下書き保存
-                logging.info("💾 記事を下書きとして保存します")
-                page.click("button:has-text('保存')")
-                page.wait_for_load_state("networkidle")
-                logging.info("✅ 記事の下書き保存が完了しました")
-                time.sleep(2)
-
-                # 公開ボタンがあれば記事を公開
-                try:
-                    if page.is_visible("button:has-text('公開する')"):
-                        logging.info("🌐 記事を公開します")
-                        page.click("button:has-text('公開する')")
-                        page.wait_for_selector(
-                            "button:has-text('有料記事として公開する')", timeout=5000
-                        )
-                        page.click("button:has-text('有料記事として公開する')")
-                        page.wait_for_load_state("networkidle")
-                        logging.info("✅ 記事の公開が完了しました")
-
-                        # 記事の状態を更新
-                        article.status = "published"
-                        article.published_at = datetime.now()
-                        return True
-                except Exception as e:
-                    logging.warning(f"記事の公開中にエラーが発生しました: {str(e)}")
-
-                return True
+        try:
+            # 新規記事作成ページにアクセス
+            self.open_editor(page)
+
+            # タイトル入力
+            page.fill('textarea[placeholder="記事タイトル"]', title)
+            page.keyboard.press("Enter")
+            time.sleep(0.5)
+            logging.info(f"📝 記事タイトル '{title}' を入力しました")
 
+            # セクションごとに処理
+            for section in sections:
+                section_type = section["type"]
+                content = section["content"]
+
+                if section_type == "paragraph":
+                    # 段落テキストを入力
+                    if logging.getLogger().isEnabledFor(logging.INFO):
+                        logging.info(f"📝 段落を入力中: {content[:30]}...")
+                    page.keyboard.insert_text(content)
+                    page.keyboard.press("Enter")
+                    page.keyboard.press("Enter")
+
+                elif section_type.startswith("heading"):
+                    # 見出しを入力
+                    level = int(section_type[-1])
+                    logging.info(f"📝 見出し{level}を入力中: {content}")
+
+                    # クリップボードを使わずに直接入力
+                    page.keyboard.insert_text(content)
+                    page.keyboard.press("Enter")
+
+                    # 見出しの書式が反映されるまで少し待つ
+                    page.wait_for_timeout(100)
+
+            # 記事を下書き保存
+            logging.info("💾 記事を下書きとして保存します")
+            page.click("button:has-text('保存')")
+            page.wait_for_load_state("networkidle")
+            logging.info("✅ 記事の下書き保存が完了しました")
+            time.sleep(2)
+
+            # 公開ボタンがあれば記事を公開
+            try:
+                if page.is_visible("button:has-text('公開する')"):
+                    logging.info("🌐 記事を公開します")
+                    page.click("button:has-text('公開する')")
+                    page.wait_for_selector(
+                        "button:has-text('有料記事として公開する')", timeout=5000
+                    )
+                    page.click("button:has-text('有料記事として公開する')")
+                    page.wait_for_load_state("networkidle")
+                    logging.info("✅ 記事の公開が完了しました")
+
+                    # 記事の状態を更新
+                    article.status = "published"
+                    article.published_at = datetime.now()
+                    return True
             except Exception as e:
-                logging.error(f"❌ エラー: {str(e)}")
-                return False
-            finally:
-                context.close()
-                browser.close()
-                logging.info("🚀 Playwright処理が完了しました")
\ No newline at end of file
+                logging.warning(f"記事の公開中にエラーが発生しました: {str(e)}")
+
+            return True
+
+        except Exception as e:
+            logging.error(f"❌ エラー: {str(e)}")
+            return False
+        finally:
+            page.close()
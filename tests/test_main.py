@@ -0,0 +1,107 @@
+# tests/test_main.py
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from main import extract_final_article, filter_age_appropriate, judge_articles
+
+
+class StubClient:
+    """Minimal OpenAI client stub for the age-appropriate filter"""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.single_calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, response_format=None):
+        if response_format is not None:
+            content = self.batch_reply
+        else:
+            # Per-article fallback: approve articles whose title starts with "ok"
+            self.single_calls += 1
+            content = "YES" if "記事のタイトル: ok" in messages[0]["content"] else "NO"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+ARTICLES = [
+    {"title": "ok 1", "description": "", "content": ""},
+    {"title": "ng 2", "description": "", "content": ""},
+    {"title": "ok 3", "description": None, "content": None},
+]
+
+
+def test_judge_articles_parses_batched_reply():
+    client = StubClient(
+        '{"results": [{"index": 1, "appropriate": true},'
+        ' {"index": 2, "appropriate": false},'
+        ' {"index": 3, "appropriate": true}]}'
+    )
+
+    assert judge_articles(client, "gpt-4o", ARTICLES) == [True, False, True]
+    assert client.single_calls == 0
+
+
+def test_judge_articles_returns_none_for_missing_verdicts():
+    client = StubClient(
+        '{"results": [{"index": 1, "appropriate": true},'
+        ' {"index": 2, "appropriate": "true"}]}'
+    )
+
+    assert judge_articles(client, "gpt-4o", ARTICLES) == [True, None, None]
+    assert client.single_calls == 0
+
+
+def test_filter_age_appropriate_caches_only_returned_verdicts(monkeypatch):
+    class DictCache(dict):
+        def set(self, key, value, expire=None):
+            self[key] = value
+
+    cache = DictCache()
+    monkeypatch.setattr(main, "get_news_cache", lambda: cache)
+    client = StubClient('{"results": [{"index": 1, "appropriate": true}]}')
+
+    assert filter_age_appropriate(client, "gpt-4o", ARTICLES) == [ARTICLES[0]]
+    assert list(cache.values()) == [True]
+    assert main.verdict_cache_key(ARTICLES[0], "gpt-4o") in cache
+    assert main.verdict_cache_key(ARTICLES[0], "gpt-4o-mini") not in cache
+
+
+@pytest.mark.parametrize(
+    "batch_reply",
+    [
+        "not json",
+        '{"verdicts": []}',
+        '{"results": [1, 2]}',
+        '{"results": {"a": 1}}',
+        '[{"index": 1, "appropriate": true}]',
+    ],
+)
+def test_judge_articles_falls_back_on_malformed_reply(batch_reply):
+    client = StubClient(batch_reply)
+
+    assert judge_articles(client, "gpt-4o", ARTICLES) == [True, False, True]
+    assert client.single_calls == len(ARTICLES)
+
+
+@pytest.mark.parametrize(
+    "reply",
+    [
+        "```final\n# タイトル\n本文\n```",
+        "(1) 下書き…\n(2) 自己評価…\n```final\n```markdown\n# タイトル\n本文\n```\n```",
+        "```final\n```\n# タイトル\n本文```\n```\n",
+        "```final\n# タイトル\n本文\n```\n補足です。\n```markdown\n# draft\n```",
+        "```final\n```markdown\n# タイトル\n本文\n```\n```\n補足です。\n```markdown\n# draft\n```",
+    ],
+)
+def test_extract_final_article(reply):
+    assert extract_final_article(reply) == "# タイトル\n本文"
+
+
+@pytest.mark.parametrize(
+    "reply",
+    ["(1) 下書き…\n# タイトル\n本文", "```final\n```", "```final\n```markdown\n```\n```"],
+)
+def test_extract_final_article_missing_or_empty(reply):
+    assert extract_final_article(reply) == ""